@@ -3,8 +3,9 @@
 # For our demonstration purposes, I'll create a script to generate a very simple ONNX model.
 
 import onnx
+import onnxruntime as ort
 from onnx import TensorProto
-from onnx.helper import make_model, make_node, make_graph, make_tensor_value_info, make_tensor
+from onnx.helper import make_model, make_node, make_graph, make_tensor_value_info, make_tensor, make_opsetid
 import numpy as np
 
 # Create a simple model that adds the features and applies a sigmoid function
@@ -15,32 +16,45 @@ import numpy as np
 X = make_tensor_value_info('input', TensorProto.FLOAT, [None, 5])  # Batch size x 5 features
 Y = make_tensor_value_info('output', TensorProto.FLOAT, [None, 1])  # Batch size x 1 score
 
-# Define the weights (these would be learned weights in a real model)
-weight_tensor = make_tensor('weights', TensorProto.FLOAT, [5, 1], 
-                           np.array([0.2, -0.1, 0.15, 0.3, 0.25], dtype=np.float32).reshape(5, 1).tobytes(), 
+# Define the weights (these would be learned weights in a real model).
+# They are stored as FP16 to halve the model size; Cast nodes widen them to
+# FP32 at load time, and the runtime constant-folds the casts away.
+weight_tensor = make_tensor('weights_fp16', TensorProto.FLOAT16, [5, 1],
+                           np.array([0.2, -0.1, 0.15, 0.3, 0.25], dtype=np.float16).reshape(5, 1).tobytes(),
                            raw=True)
-bias_tensor = make_tensor('bias', TensorProto.FLOAT, [1], 
-                         np.array([0.1], dtype=np.float32).tobytes(), 
+bias_tensor = make_tensor('bias_fp16', TensorProto.FLOAT16, [1],
+                         np.array([0.1], dtype=np.float16).tobytes(),
                          raw=True)
 
-# Define nodes
-matmul_node = make_node('MatMul', ['input', 'weights'], ['matmul_output'])
-add_node = make_node('Add', ['matmul_output', 'bias'], ['add_output'])
-sigmoid_node = make_node('Sigmoid', ['add_output'], ['output'])
+# Define nodes: a single Gemm fuses the MatMul and Add into one kernel
+cast_weights_node = make_node('Cast', ['weights_fp16'], ['weights'], to=TensorProto.FLOAT)
+cast_bias_node = make_node('Cast', ['bias_fp16'], ['bias'], to=TensorProto.FLOAT)
+gemm_node = make_node('Gemm', ['input', 'weights', 'bias'], ['gemm_output'], alpha=1.0, beta=1.0)
+sigmoid_node = make_node('Sigmoid', ['gemm_output'], ['output'])
 
 # Create the graph
 graph = make_graph(
-    [matmul_node, add_node, sigmoid_node],
+    [cast_weights_node, cast_bias_node, gemm_node, sigmoid_node],
     'variant-scoring-model',
     [X],
     [Y],
     [weight_tensor, bias_tensor]
 )
 
-# Create the model
-model = make_model(graph, producer_name='variant-scorer-sample')
+# Create the model, pinned to a released opset so any runtime can load it
+model = make_model(graph, producer_name='variant-scorer-sample',
+                   opset_imports=[make_opsetid('', 17)])
 
 # Save the model
 onnx.save(model, 'variant_model.onnx')
 
-print("Sample ONNX model saved to variant_model.onnx")
\ No newline at end of file
+print("Sample ONNX model saved to variant_model.onnx")
+
+# Run ONNX Runtime's graph optimizer once at build time and persist the
+# optimized graph, so consumers don't pay the optimization cost on every load.
+sess_options = ort.SessionOptions()
+sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+sess_options.optimized_model_filepath = 'variant_model_opt.onnx'
+ort.InferenceSession('variant_model.onnx', sess_options, providers=['CPUExecutionProvider'])
+
+print("Optimized ONNX model saved to variant_model_opt.onnx")
\ No newline at end of file
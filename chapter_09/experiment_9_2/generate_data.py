@@ -1,112 +1,204 @@
 #!/usr/bin/env python3
 import json
-import random
 import argparse
 import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
-def generate_random_sequence(length: int) -> str:
-    bases = ['A', 'T', 'G', 'C']
-    return ''.join(random.choice(bases) for _ in range(length))
-
-def generate_kmers_from_sequence(sequence: str, k: int):
-    if len(sequence) < k:
-        return []
-    return [sequence[i:i+k] for i in range(len(sequence) - k + 1)]
-
-def generate_transcript_sequences(num_transcripts: int, min_length: int = 500, max_length: int = 3000):
-    transcripts = {}
-    for i in range(num_transcripts):
-        transcript_id = f"transcript_{i:04d}"
-        length = random.randint(min_length, max_length)
-        sequence = generate_random_sequence(length)
-        transcripts[transcript_id] = sequence
-    return transcripts
-
-def generate_kmer_index(transcripts, k: int = 31):
-    kmer_to_transcripts = {}
-    
-    for transcript_id, sequence in transcripts.items():
-        kmers = generate_kmers_from_sequence(sequence, k)
-        for kmer in kmers:
-            if kmer not in kmer_to_transcripts:
-                kmer_to_transcripts[kmer] = []
-            kmer_to_transcripts[kmer].append(transcript_id)
-    
-    kmer_index = []
-    for kmer, transcript_list in kmer_to_transcripts.items():
-        kmer_index.append({
-            "kmer": kmer,
-            "transcripts": list(set(transcript_list)),
+import numpy as np
+
+try:
+    import orjson  # SIMD-accelerated encoder, optional
+except ImportError:
+    orjson = None
+
+# Maps 2-bit base codes (0..3) to ASCII bases.
+_CODE_TO_BASE = bytes.maketrans(b'\x00\x01\x02\x03', b'ACGT')
+
+def decode_sequence(seq_codes: np.ndarray) -> str:
+    """Decode a uint8 array of 2-bit base codes back to an ACGT string."""
+    return seq_codes.tobytes().translate(_CODE_TO_BASE).decode('ascii')
+
+def pack_kmers(seq_codes: np.ndarray, k: int) -> np.ndarray:
+    """Pack every k-mer of a 2-bit encoded sequence into a uint64 array.
+
+    Requires k <= 32 so a k-mer fits in one 64-bit word.
+    """
+    length = seq_codes.size
+    if length < k:
+        return np.empty(0, dtype=np.uint64)
+    codes = seq_codes.astype(np.uint64)
+    kmers = np.zeros(length - k + 1, dtype=np.uint64)
+    for i in range(k):
+        kmers = (kmers << np.uint64(2)) | codes[i:length - k + 1 + i]
+    return kmers
+
+def decode_kmer(kmer_code: int, k: int) -> str:
+    codes = (kmer_code >> (2 * np.arange(k - 1, -1, -1))) & 3
+    return codes.astype(np.uint8).tobytes().translate(_CODE_TO_BASE).decode('ascii')
+
+def generate_transcript_sequences(num_transcripts: int, rng: np.random.Generator, min_length: int = 500, max_length: int = 3000):
+    """Generate all transcripts as one contiguous code buffer plus offsets.
+
+    Returns (transcript_ids, seq_buf, offsets): transcript i occupies
+    seq_buf[offsets[i]:offsets[i+1]] as 2-bit base codes. Keeping one flat
+    uint8 buffer gives the k-mer and read-sampling passes sequential memory
+    access instead of chasing scattered Python strings.
+    """
+    transcript_ids = [f"transcript_{i:04d}" for i in range(num_transcripts)]
+    lengths = rng.integers(min_length, max_length + 1, size=num_transcripts)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    seq_buf = rng.integers(0, 4, size=int(offsets[-1]), dtype=np.uint8)
+    return transcript_ids, seq_buf, offsets
+
+def _index_transcript_chunk(chunk, k: int):
+    """Worker: build a partial k-mer -> transcript-set map for one chunk."""
+    partial = defaultdict(set)
+    for transcript_id, seq_codes in chunk:
+        for kmer_code in np.unique(pack_kmers(seq_codes, k)):
+            partial[int(kmer_code)].add(transcript_id)
+    return partial
+
+def generate_kmer_index(transcript_ids, seq_buf, offsets, k: int = 31):
+    """Yield one index entry per distinct k-mer instead of returning a list.
+
+    Transcripts are indexed in parallel worker processes (they are
+    independent), and the partial maps are merged in the parent.
+    """
+    if k > 32:
+        raise ValueError("k must be <= 32 for 2-bit packed k-mers")
+
+    items = [
+        (transcript_id, seq_buf[offsets[i]:offsets[i + 1]])
+        for i, transcript_id in enumerate(transcript_ids)
+    ]
+    n_workers = min(os.cpu_count() or 1, len(items)) or 1
+    chunks = [items[i::n_workers] for i in range(n_workers)]
+
+    kmer_to_transcripts = defaultdict(set)
+    if n_workers == 1:
+        partials = [_index_transcript_chunk(chunks[0], k)] if items else []
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            partials = list(pool.map(_index_transcript_chunk, chunks, [k] * n_workers))
+
+    for partial in partials:
+        for kmer_code, transcript_set in partial.items():
+            kmer_to_transcripts[kmer_code].update(transcript_set)
+
+    for kmer_code, transcript_set in kmer_to_transcripts.items():
+        yield {
+            "kmer": decode_kmer(kmer_code, k),
+            "transcripts": list(transcript_set),
             "transcript_positions": None
-        })
-    
-    return kmer_index
-
-def introduce_errors(sequence: str, error_rate: float) -> str:
-    bases = ['A', 'T', 'G', 'C']
-    seq_list = list(sequence)
-    
-    for i in range(len(seq_list)):
-        if random.random() < error_rate:
-            original_base = seq_list[i]
-            new_base = random.choice([b for b in bases if b != original_base])
-            seq_list[i] = new_base
-    
-    return ''.join(seq_list)
-
-def write_fastq(reads, filename: str):
-    with open(filename, 'w') as f:
+        }
+
+def write_kmer_index(transcript_ids, seq_buf, offsets, k: int, filename: str) -> int:
+    """Stream the index to disk as one compact JSON array, entry by entry.
+
+    Serializing each entry separately keeps peak memory at one entry instead
+    of the whole index plus its JSON string.
+    """
+    if orjson is not None:
+        dumps = orjson.dumps
+    else:
+        dumps = lambda entry: json.dumps(entry).encode('ascii')
+
+    num_kmers = 0
+    with open(filename, 'wb') as f:
+        f.write(b'[')
+        for entry in generate_kmer_index(transcript_ids, seq_buf, offsets, k):
+            if num_kmers:
+                f.write(b',\n')
+            f.write(dumps(entry))
+            num_kmers += 1
+        f.write(b']')
+    return num_kmers
+
+def introduce_errors(read_block: np.ndarray, error_rate: float, rng: np.random.Generator) -> np.ndarray:
+    """Flip bases in-place in a (num_reads, read_length) block of 2-bit codes.
+
+    Each base mutates with probability error_rate; adding a random offset in
+    1..3 modulo 4 always yields a different base, so no rejection loop is
+    needed.
+    """
+    mask = rng.random(read_block.shape) < error_rate
+    offsets = rng.integers(1, 4, size=read_block.shape, dtype=np.uint8)
+    read_block[mask] = (read_block[mask] + offsets[mask]) & 3
+    return read_block
+
+def write_fastq(reads, filename: str, chunk_size: int = 10000):
+    """Write reads in binary mode, batching records to avoid per-read syscalls."""
+    with open(filename, 'wb', buffering=1 << 20) as f:
+        chunk = []
+        quality = b''
         for i, read in enumerate(reads):
-            read_id = f"read_{i:08d}"
-            quality = 'I' * len(read)
-            
-            f.write(f"@{read_id}\n")
-            f.write(f"{read}\n")
-            f.write(f"+\n")
-            f.write(f"{quality}\n")
-
-def generate_expression_profile(num_transcripts: int):
-    import math
-    
-    expression = {}
-    for i in range(num_transcripts):
-        transcript_id = f"transcript_{i:04d}"
-        log_expr = random.normalvariate(2, 1.5)
-        expression[transcript_id] = math.exp(log_expr)
-    
-    return expression
-
-def generate_weighted_reads(transcripts, expression_profile, total_reads: int, read_length: int = 100, error_rate: float = 0.01):
-    reads = []
-    
-    total_expression = sum(expression_profile.values())
-    normalized_expression = {
-        tid: expr / total_expression 
-        for tid, expr in expression_profile.items()
+            if len(quality) != len(read):
+                quality = b'I' * len(read)
+            chunk.append(b'@read_%08d\n%s\n+\n%s\n' % (i, read.encode('ascii'), quality))
+            if len(chunk) == chunk_size:
+                f.writelines(chunk)
+                chunk = []
+        f.writelines(chunk)
+
+def generate_expression_profile(num_transcripts: int, rng: np.random.Generator):
+    log_expr = rng.normal(2, 1.5, size=num_transcripts)
+    return {
+        f"transcript_{i:04d}": expr
+        for i, expr in enumerate(np.exp(log_expr))
     }
-    
-    transcript_reads = {}
-    for transcript_id, expr_fraction in normalized_expression.items():
-        transcript_reads[transcript_id] = int(total_reads * expr_fraction)
-    
-    for transcript_id, num_reads in transcript_reads.items():
-        if transcript_id not in transcripts:
-            continue
-            
-        transcript_seq = transcripts[transcript_id]
-        if len(transcript_seq) < read_length:
-            continue
-        
-        for _ in range(num_reads):
-            start_pos = random.randint(0, len(transcript_seq) - read_length)
-            read_seq = transcript_seq[start_pos:start_pos + read_length]
-            
-            if error_rate > 0:
-                read_seq = introduce_errors(read_seq, error_rate)
-            
-            reads.append(read_seq)
-    
-    random.shuffle(reads)
+
+def _generate_read_chunk(chunk, read_length: int, error_rate: float, child_seed):
+    """Worker: sample reads for one chunk of (seq_codes, num_reads) pairs."""
+    rng = np.random.default_rng(child_seed)
+    reads = []
+    for seq_codes, num_reads in chunk:
+        starts = rng.integers(0, len(seq_codes) - read_length + 1, size=num_reads)
+        read_block = seq_codes[starts[:, None] + np.arange(read_length)]
+
+        if error_rate > 0:
+            introduce_errors(read_block, error_rate, rng)
+
+        block_bytes = read_block.tobytes().translate(_CODE_TO_BASE)
+        reads.extend(
+            block_bytes[row * read_length:(row + 1) * read_length].decode('ascii')
+            for row in range(num_reads)
+        )
+    return reads
+
+def generate_weighted_reads(seq_buf, offsets, expression_profile, total_reads: int, rng: np.random.Generator,
+                            seed_seq: np.random.SeedSequence, read_length: int = 100, error_rate: float = 0.01):
+    # One multinomial draw allocates exactly total_reads across transcripts,
+    # unlike per-transcript int(total_reads * fraction) truncation.
+    probs = np.array(list(expression_profile.values()))
+    probs /= probs.sum()
+    read_counts = rng.multinomial(total_reads, probs)
+
+    work_items = [
+        (seq_buf[offsets[i]:offsets[i + 1]], int(num_reads))
+        for i, num_reads in enumerate(read_counts)
+        if offsets[i + 1] - offsets[i] >= read_length and num_reads > 0
+    ]
+
+    # Transcripts are sampled independently, so spread them over worker
+    # processes, each with its own spawned child RNG stream.
+    n_workers = min(os.cpu_count() or 1, len(work_items)) or 1
+    chunks = [work_items[i::n_workers] for i in range(n_workers)]
+    child_seeds = seed_seq.spawn(n_workers)
+
+    reads = []
+    if n_workers == 1:
+        if work_items:
+            reads = _generate_read_chunk(chunks[0], read_length, error_rate, child_seeds[0])
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            for chunk_reads in pool.map(_generate_read_chunk, chunks,
+                                        [read_length] * n_workers,
+                                        [error_rate] * n_workers,
+                                        child_seeds):
+                reads.extend(chunk_reads)
+
+    rng.shuffle(reads)
     return reads
 
 def main():
@@ -117,42 +209,43 @@ def main():
     parser.add_argument('--kmer-length', type=int, default=31, help='K-mer length')
     parser.add_argument('--error-rate', type=float, default=0.02, help='Sequencing error rate')
     parser.add_argument('--seed', type=int, default=42, help='Random seed')
-    
+
     args = parser.parse_args()
-    
-    random.seed(args.seed)
+
+    seed_seq = np.random.SeedSequence(args.seed)
+    rng = np.random.default_rng(seed_seq)
     os.makedirs('data', exist_ok=True)
-    
+
     print(f"Generating {args.num_transcripts} transcripts and {args.num_reads} reads...")
-    
-    transcripts = generate_transcript_sequences(args.num_transcripts)
-    expression_profile = generate_expression_profile(args.num_transcripts)
-    kmer_index = generate_kmer_index(transcripts, args.kmer_length)
-    
-    with open('data/kmer_index.json', 'w') as f:
-        json.dump(kmer_index, f, indent=2)
-    
+
+    transcript_ids, seq_buf, offsets = generate_transcript_sequences(args.num_transcripts, rng)
+    expression_profile = generate_expression_profile(args.num_transcripts, rng)
+    num_kmers = write_kmer_index(transcript_ids, seq_buf, offsets, args.kmer_length, 'data/kmer_index.json')
+
     reads = generate_weighted_reads(
-        transcripts, 
-        expression_profile, 
+        seq_buf,
+        offsets,
+        expression_profile,
         args.num_reads,
+        rng,
+        seed_seq,
         args.read_length,
         args.error_rate
     )
-    
+
     write_fastq(reads, 'data/reads.fastq')
-    
+
     with open('data/transcripts.fasta', 'w') as f:
-        for transcript_id, sequence in transcripts.items():
-            f.write(f">{transcript_id}\n{sequence}\n")
-    
+        for i, transcript_id in enumerate(transcript_ids):
+            f.write(f">{transcript_id}\n{decode_sequence(seq_buf[offsets[i]:offsets[i + 1]])}\n")
+
     with open('data/true_expression.tsv', 'w') as f:
         f.write("transcript_id\ttrue_expression\n")
         for transcript_id, expr in sorted(expression_profile.items()):
             f.write(f"{transcript_id}\t{expr:.6f}\n")
-    
+
     print("✓ Sample dataset generated successfully!")
-    print(f"  - {len(kmer_index)} k-mers in index")
+    print(f"  - {num_kmers} k-mers in index")
     print(f"  - {len(reads)} reads generated")
     print("  - Files: data/kmer_index.json, data/reads.fastq")
 
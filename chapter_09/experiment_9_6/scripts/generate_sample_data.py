@@ -9,81 +9,133 @@ import pandas as pd
 import json
 from pathlib import Path
 
-def convert_numpy_types(obj):
-    """Convert numpy types to native Python types for JSON serialization."""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _signature_boost_kernel(gene_idx, cell_idx, count, n_genes, n_types, noise):
+        """Multiply counts of signature genes in-place, one prange pass."""
+        sig_size = n_genes // n_types
+        for i in prange(count.size):
+            cell_type = cell_idx[i] % n_types
+            lo = cell_type * sig_size
+            hi = min(lo + sig_size, n_genes)
+            if lo <= gene_idx[i] and gene_idx[i] < hi:
+                count[i] *= noise[i]
+
+def numpy_json_default(obj):
+    """Coerce numpy scalars/arrays lazily during JSON encoding.
+
+    Passed as json.dump(..., default=...), so only values the encoder cannot
+    handle natively are touched — no recursive pre-pass over the whole dict.
+    """
+    if isinstance(obj, np.ndarray):
         return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def write_sparse_counts(df, output_file):
+    """Write the sparse matrix TSV, preferring pyarrow's C csv writer.
+
+    pandas.to_csv formats every value through Python; pyarrow formats in C
+    and writes chunked. Falls back to pandas when pyarrow is missing.
+    """
+    if pa is not None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pacsv.write_csv(table, output_file,
+                        write_options=pacsv.WriteOptions(delimiter='\t', quoting_style='none',
+                                                         quoting_header='none'))
     else:
-        return obj
+        df.to_csv(output_file, sep='\t', index=False)
+
+def write_sparse_npz(gene_idx, cell_idx, count, n_genes, n_cells, output_file):
+    """Also persist the matrix as a scipy CSR .npz.
+
+    Loading the .npz hands downstream consumers a ready sparse matrix with
+    no TSV parsing; the triples are already deduplicated, so the COO→CSR
+    conversion is a straight conversion.
+    """
+    mat = sp.coo_matrix((count, (gene_idx, cell_idx)), shape=(n_genes, n_cells))
+    sp.save_npz(output_file, mat.tocsr())
 
 def generate_simple_synthetic_data(n_cells=1000, n_genes=2000, seed=42):
     """Generate simple synthetic single-cell data."""
-    np.random.seed(seed)
-    
+    # SeedSequence makes the seeding explicit and leaves .spawn() available
+    # if generation is ever split across workers
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+
     print(f"Generating synthetic data:")
     print(f"  Cells: {n_cells:,}")
     print(f"  Genes: {n_genes:,}")
-    
+
     # Generate realistic sparse entries
     target_entries = int(n_cells * n_genes * 0.15)  # 15% fill rate
-    
-    entries = []
-    for _ in range(target_entries):
-        gene_idx = np.random.randint(0, n_genes)
-        cell_idx = np.random.randint(0, n_cells)
-        
-        # Generate realistic count using exponential + poisson
-        base_rate = np.random.exponential(1.5)
-        count = max(1, int(np.random.poisson(base_rate) + 1))
-        
-        entries.append({
-            'gene_idx': int(gene_idx),  # Ensure native Python int
-            'cell_idx': int(cell_idx),  # Ensure native Python int
-            'count': float(count)       # Ensure native Python float
-        })
-    
-    # Convert to DataFrame and remove duplicates
-    df = pd.DataFrame(entries)
-    df = df.groupby(['gene_idx', 'cell_idx'])['count'].max().reset_index()
-    
-    # Add cell type structure
+
+    # Draw (gene, cell) pairs without replacement from the linearized grid:
+    # exactly target_entries distinct pairs, so the fill rate is exact and
+    # the max-aggregation below never has duplicates to merge
+    linear = rng.choice(n_genes * n_cells, size=target_entries, replace=False)
+
+    # Generate realistic counts using exponential + poisson; the Ziggurat
+    # method avoids the per-sample log() of the inverse-CDF exponential.
+    # Poisson draws are >= 0, so the +1 alone guarantees counts >= 1.
+    base_rate = rng.standard_exponential(target_entries, method='zig') * 1.5
+    count = (rng.poisson(base_rate) + 1).astype(np.float32)
+
+    # linear is itself the gene-major sort key (gene * n_cells + cell), so
+    # one argsort on it yields (gene_idx, cell_idx) lex order directly; the
+    # index columns are decoded from the already-sorted key
+    order = np.argsort(linear, kind='stable')
+    key = linear[order]
+    count = count[order]
+    gene_idx, cell_idx = np.divmod(key, n_cells)
+    gene_idx = gene_idx.astype(np.int32)
+    cell_idx = cell_idx.astype(np.int32)
+
+    # A strictly increasing key means every (gene, cell) pair is distinct —
+    # always true with without-replacement sampling — and one O(n) check
+    # then skips the whole aggregation pass
+    if not (np.diff(key) > 0).all():
+        is_group_start = np.concatenate(([True], key[1:] != key[:-1]))
+        group_starts = np.flatnonzero(is_group_start)
+        gene_idx = gene_idx[is_group_start]
+        cell_idx = cell_idx[is_group_start]
+        count = np.maximum.reduceat(count, group_starts)
+
+    # Add cell type structure: boost signature genes for each cell type.
+    # The signature window per row follows from its cell type; the numba
+    # kernel fuses the membership test and multiply into one parallel pass,
+    # with a numpy boolean-mask fallback when numba is unavailable.
     n_types = 5
-    enhanced_entries = []
-    
-    for _, row in df.iterrows():
-        gene_idx = int(row['gene_idx'])
-        cell_idx = int(row['cell_idx'])
-        count = float(row['count'])
-        
-        # Assign cell type
-        cell_type = cell_idx % n_types
-        
-        # Boost signature genes for each cell type
+    noise = rng.uniform(2.0, 4.0, size=count.size).astype(np.float32)
+    if njit is not None:
+        _signature_boost_kernel(gene_idx, cell_idx, count, n_genes, n_types, noise)
+    else:
         type_signature_size = n_genes // n_types
-        signature_start = cell_type * type_signature_size
-        signature_end = min((cell_type + 1) * type_signature_size, n_genes)
-        
-        if signature_start <= gene_idx < signature_end:
-            count *= np.random.uniform(2.0, 4.0)
-        
-        enhanced_entries.append({
-            'gene_idx': gene_idx,
-            'cell_idx': cell_idx,
-            'count': count
-        })
-    
-    df_final = pd.DataFrame(enhanced_entries)
-    df_final = df_final.sort_values(['gene_idx', 'cell_idx'])
-    
-    return df_final
+        signature_start = (cell_idx % n_types) * type_signature_size
+        signature_end = np.minimum(signature_start + type_signature_size, n_genes)
+        in_signature = (gene_idx >= signature_start) & (gene_idx < signature_end)
+        count[in_signature] *= noise[in_signature]
+
+    # Rows are already in (gene_idx, cell_idx) order from the dedup sort.
+    # Return the column arrays themselves; callers build a DataFrame only
+    # where an API demands one.
+    return gene_idx, cell_idx, count
 
 def main():
     print("=== Fixed Single-Cell Data Generator ===")
@@ -92,23 +144,30 @@ def main():
     Path("data/raw").mkdir(parents=True, exist_ok=True)
     Path("data/synthetic").mkdir(parents=True, exist_ok=True)
     
-    # Generate data
-    df = generate_simple_synthetic_data()
-    
-    # Save sparse matrix
+    # Generate data as three column arrays; the dict-of-arrays DataFrame
+    # constructor below is pandas' zero-copy fast path
+    gene_idx, cell_idx, count = generate_simple_synthetic_data()
+    df = pd.DataFrame({'gene_idx': gene_idx, 'cell_idx': cell_idx, 'count': count})
+
+    # Save sparse matrix; the TSV stays because validate_input.py reads it
     output_file = "data/raw/sparse_counts.tsv"
-    df.to_csv(output_file, sep='\t', index=False)
-    
-    # Calculate statistics (ensure all are native Python types)
+    write_sparse_counts(df, output_file)
+    if sp is not None:
+        write_sparse_npz(gene_idx, cell_idx, count, n_genes=2000, n_cells=1000,
+                         output_file="data/raw/sparse_counts.npz")
+
+    # Calculate statistics on the raw arrays (gene_idx is sorted, so its
+    # unique count is a diff step count); float() casts keep everything a
+    # native Python type for JSON
     stats = {
-        'total_entries': int(len(df)),
-        'unique_genes': int(df['gene_idx'].nunique()),
-        'unique_cells': int(df['cell_idx'].nunique()),
-        'total_counts': float(df['count'].sum()),
-        'mean_count': float(df['count'].mean()),
-        'median_count': float(df['count'].median()),
-        'max_count': float(df['count'].max()),
-        'min_count': float(df['count'].min()),
+        'total_entries': int(count.size),
+        'unique_genes': 1 + int(np.count_nonzero(np.diff(gene_idx))),
+        'unique_cells': int(np.unique(cell_idx).size),
+        'total_counts': float(count.sum(dtype=np.float64)),
+        'mean_count': float(count.mean(dtype=np.float64)),
+        'median_count': float(np.median(count)),
+        'max_count': float(count.max()),
+        'min_count': float(count.min()),
         'generation_parameters': {
             'n_cells': 1000,
             'n_genes': 2000,
@@ -125,7 +184,7 @@ def main():
     metadata_file = "data/synthetic/metadata.json"
     try:
         with open(metadata_file, 'w') as f:
-            json.dump(stats, f, indent=2)
+            json.dump(stats, f, indent=2, default=numpy_json_default)
         print(f"✅ Metadata saved to: {metadata_file}")
     except Exception as e:
         print(f"⚠️  Could not save metadata: {e}")
@@ -1,52 +1,122 @@
 #!/usr/bin/env python3
 
 import pandas as pd
+import numpy as np
 import sys
 import os
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+REQUIRED_COLS = ['gene_idx', 'cell_idx', 'count']
+
+# The generator emits 32-bit columns; pinning the read types stops the CSV
+# reader from inferring (and the rest of the pipeline from paying for) 64-bit.
+COLUMN_TYPES = {'gene_idx': 'int32', 'cell_idx': 'int32', 'count': 'float32'}
+
+
+def validate_streaming(input_file, output_file):
+    """Validate with pyarrow's streaming CSV reader, one batch at a time.
+
+    Each batch is filtered and written out immediately, so peak memory stays
+    at one batch regardless of input size. Unique ids are accumulated as
+    per-batch unique arrays and deduplicated once at the end.
+    """
+    reader = pacsv.open_csv(
+        input_file,
+        parse_options=pacsv.ParseOptions(delimiter='\t'),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: pa.type_for_alias(t) for col, t in COLUMN_TYPES.items()}))
+    missing_cols = [col for col in REQUIRED_COLS if col not in reader.schema.names]
+    if missing_cols:
+        raise ValueError(f"Missing required columns: {missing_cols}")
+
+    total_entries = 0
+    nonzero_entries = 0
+    total_counts = 0.0
+    gene_chunks = []
+    cell_chunks = []
+    with pacsv.CSVWriter(
+            output_file, reader.schema,
+            write_options=pacsv.WriteOptions(
+                delimiter='\t', quoting_style='none', quoting_header='none')) as writer:
+        for batch in reader:
+            total_entries += batch.num_rows
+            filtered = batch.filter(pc.greater(batch['count'], 0))
+            if filtered.num_rows == 0:
+                continue
+            nonzero_entries += filtered.num_rows
+            total_counts += pc.sum(filtered['count']).as_py()
+            gene_chunks.append(pc.unique(filtered['gene_idx']))
+            cell_chunks.append(pc.unique(filtered['cell_idx']))
+            writer.write(filtered)
+
+    unique_genes = pc.count_distinct(pa.chunked_array(gene_chunks)).as_py() if gene_chunks else 0
+    unique_cells = pc.count_distinct(pa.chunked_array(cell_chunks)).as_py() if cell_chunks else 0
+    return total_entries, nonzero_entries, unique_genes, unique_cells, total_counts
+
+
+def validate_pandas(input_file, output_file):
+    """Fallback: validate in one pass through pandas."""
+    df = pd.read_csv(input_file, sep='\t', header=0,
+                     dtype=COLUMN_TYPES, engine='c')
+    missing_cols = [col for col in REQUIRED_COLS if col not in df.columns]
+    if missing_cols:
+        raise ValueError(f"Missing required columns: {missing_cols}")
+
+    # Remove zero counts; the selection is only read from afterwards, so no
+    # defensive copy is needed
+    df_filtered = df[df['count'] > 0]
+    df_filtered.to_csv(output_file, sep='\t', index=False)
+
+    # The generator emits rows sorted by (gene_idx, cell_idx), so unique
+    # counts reduce to counting steps in sorted arrays — no hash table.
+    gene = df_filtered['gene_idx'].values
+    if gene.size and np.any(np.diff(gene) < 0):
+        gene = np.sort(gene)
+    cell = np.sort(df_filtered['cell_idx'].values)
+    unique_genes = 1 + int(np.count_nonzero(np.diff(gene))) if gene.size else 0
+    unique_cells = 1 + int(np.count_nonzero(np.diff(cell))) if cell.size else 0
+
+    return (len(df), len(df_filtered), unique_genes, unique_cells,
+            df_filtered['count'].sum())
+
+
 def main():
     if len(sys.argv) != 3:
         print("Usage: python validate_input.py <input_file> <output_dir>")
         sys.exit(1)
-    
+
     input_file = sys.argv[1]
     output_dir = sys.argv[2]
-    
+
     try:
         print(f"Validating input matrix: {input_file}")
-        df = pd.read_csv(input_file, sep='\t', header=0)
-        print(f"Input shape: {df.shape}")
-        
-        # Check required columns
-        required_cols = ['gene_idx', 'cell_idx', 'count']
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        
-        if missing_cols:
-            raise ValueError(f"Missing required columns: {missing_cols}")
-        
-        # Remove zero counts
-        df_filtered = df[df['count'] > 0].copy()
-        
-        # Save validated matrix
         output_file = os.path.join(output_dir, "validated_matrix.tsv")
-        df_filtered.to_csv(output_file, sep='\t', index=False)
-        
+        validate = validate_streaming if pa is not None else validate_pandas
+        (total_entries, nonzero_entries,
+         unique_genes, unique_cells, total_counts) = validate(input_file, output_file)
+
         # Generate report
         report = f"""Input Validation Report
 ======================
-Original entries: {len(df):,}
-Non-zero entries: {len(df_filtered):,}
-Unique genes: {df_filtered['gene_idx'].nunique():,}
-Unique cells: {df_filtered['cell_idx'].nunique():,}
-Total counts: {df_filtered['count'].sum():,.0f}"""
-        
+Original entries: {total_entries:,}
+Non-zero entries: {nonzero_entries:,}
+Unique genes: {unique_genes:,}
+Unique cells: {unique_cells:,}
+Total counts: {total_counts:,.0f}"""
+
         report_file = os.path.join(output_dir, "validation_report.txt")
         with open(report_file, 'w') as f:
             f.write(report)
-            
+
         print("Validation completed successfully")
         print(f"Output files: {output_file}, {report_file}")
-        
+
     except Exception as e:
         print(f"Validation failed: {e}")
         # Make sure output directory exists